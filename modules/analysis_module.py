@@ -1,5 +1,9 @@
 import os
 import csv
+import math
+import random
+from statistics import NormalDist
+import modules.anomaly_module as ad
 
 class SurveyDataAnalyzer:
     """
@@ -20,12 +24,25 @@ class SurveyDataAnalyzer:
         data = self.survey_sheet.get_all_values()
         return data[1:]  # Exclude the header row
 
-    def calculate_averages(self):
+    def calculate_averages(self, data=None):
         """
         Calculate average ratings for each survey question.
-        Computes total sums and averages for four survey questions.
+        Rounds the means of the four survey questions to whole ratings.
+        Uses the given survey rows if provided, otherwise reads the worksheet.
+        """
+        if data is None:
+            data = self.get_survey_data()
+        means = self.calculate_means(data)
+
+        # Round averages to whole ratings
+        averages = [round(mean) for mean in means]
+        return averages
+
+    def calculate_means(self, data):
+        """
+        Calculate the unrounded mean rating of each survey question.
+        Computes total sums and means for four survey questions.
         """
-        data = self.get_survey_data()
         total_sums = [0, 0, 0, 0]  # There are 4 questions in the survey
         count = len(data)  # Number of responses (rows)
 
@@ -39,9 +56,70 @@ class SurveyDataAnalyzer:
         if count == 0:
             return [0, 0, 0, 0]  # Avoid division by zero if no data is present
 
-        # Calculate and round averages
-        averages = [round(total / count) for total in total_sums]
-        return averages
+        return [total / count for total in total_sums]
+
+    def estimate_averages(self, precision=0.25, confidence=0.95, min_sample=30):
+        """
+        Estimate average ratings from a simple random sample of worksheet rows.
+        Returns a list of (mean, lower, upper) confidence intervals, one per question,
+        and the number of responses used. Falls back to the exact averages when the
+        sample would cover a large part of the sheet or too few rows are usable.
+
+        :param precision: Target half-width of the confidence intervals.
+        :param confidence: Confidence level of the intervals.
+        :param min_sample: Smallest number of sampled responses an interval is built from.
+        """
+        # Read only the ID column to find which sheet rows hold responses
+        ids = self.survey_sheet.col_values(1)[1:]  # Exclude the header row
+        positions = [index for index, customer_id in enumerate(ids) if customer_id]
+        total_responses = len(positions)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        # Ratings from 1 to 5 have a standard deviation of at most 2
+        required = max(math.ceil((z * 2 / precision) ** 2), min_sample)
+        if total_responses > 0:
+            required = math.ceil(required / (1 + (required - 1) / total_responses))  # Finite population correction
+
+        if required < min_sample or required * 2 >= total_responses:
+            # Small sheet: reading every row is about as cheap as sampling
+            return self.exact_estimates()
+
+        # Draw independent rows and merge neighbouring ones into ranges for a single request
+        positions = sorted(random.sample(positions, required))
+        ranges = []
+        first = last = positions[0]
+        for position in positions[1:]:
+            if position != last + 1:
+                ranges.append(f"A{first + 2}:E{last + 2}")  # Sheet rows start at 1, after the header
+                first = position
+            last = position
+        ranges.append(f"A{first + 2}:E{last + 2}")
+
+        sample = [
+            row for block in self.survey_sheet.batch_get(ranges) for row in block
+            if len(row) >= 5 and row[0]
+        ]
+        count = len(sample)
+        if count < min_sample:
+            # Too few usable rows for a meaningful interval
+            return self.exact_estimates()
+
+        means = self.calculate_means(sample)
+        estimates = []
+        for column, mean in enumerate(means, start=1):
+            variance = sum((int(row[column]) - mean) ** 2 for row in sample) / (count - 1)
+            margin = z * math.sqrt(variance / count * (1 - count / total_responses))
+            estimates.append((mean, mean - margin, mean + margin))
+        return estimates, count
+
+    def exact_estimates(self):
+        """
+        Return the exact averages in the format of estimate_averages.
+        Reads every survey row, so the intervals have zero width.
+        """
+        data = self.get_survey_data()
+        means = self.calculate_means(data)
+        return [(mean, mean, mean) for mean in means], len(data)
 
     class FeedbackProvider:
         """
@@ -115,8 +193,9 @@ class ReportExporter:
             filename = 'reports/analysis_report.csv'  # Path to the CSV file
 
             # Collect data
-            averages = self.survey_data_analyzer.calculate_averages()
-            total_responses = len(self.survey_data_analyzer.get_survey_data())
+            survey_data = self.survey_data_analyzer.get_survey_data()  # Read the survey rows once
+            averages = self.survey_data_analyzer.calculate_averages(survey_data)
+            total_responses = len(survey_data)
 
             # Create feedback based on averages
             feedback_provider = SurveyDataAnalyzer.FeedbackProvider()
@@ -173,16 +252,22 @@ class Analysis:
         self.data_analyzer = SurveyDataAnalyzer(google_sheet.get_worksheet("survey"))
         self.feedback_provider = SurveyDataAnalyzer.FeedbackProvider()
         self.report_exporter = ReportExporter(self.data_analyzer)
+        self.anomaly_detector = ad.RatingAnomalyDetector()
         self.google_sheet = google_sheet
 
-    def update_analysis_worksheet(self):
+    def update_analysis_worksheet(self, snapshot=None):
         """
         Update the analysis worksheet with the latest averages.
         Appends a new row with the number of responses and average ratings.
+        Uses the given survey worksheet rows if provided, otherwise reads the worksheet.
         """
-        averages = self.data_analyzer.calculate_averages()
+        if snapshot is not None:
+            survey_data = snapshot[1:]  # Exclude the header row
+        else:
+            survey_data = self.data_analyzer.get_survey_data()  # Read the survey rows once
+        averages = self.data_analyzer.calculate_averages(survey_data)
         analysis_sheet = self.google_sheet.get_worksheet("analysis")
-        number_of_responses = len(self.data_analyzer.get_survey_data())
+        number_of_responses = len(survey_data)
 
         data = [
             number_of_responses,  # Number of responses
@@ -194,10 +279,21 @@ class Analysis:
         analysis_sheet.append_row(data)
         print("Analysis worksheet updated successfully.")
 
+        # Feed responses not yet seen by the detector and report any rating drops
+        try:
+            alerts = self.anomaly_detector.observe_rows(survey_data)
+        except Exception as e:
+            # The analysis row is already saved, so a detector failure must not fail the refresh
+            print(f"An error occurred while checking for rating drops: {e}")
+            alerts = []
+        for alert in alerts:
+            print(f"Alert: {alert}")
+
     def display_functionality_menu(self):
         """
         Display functionality menu and handle user choices.
-        Provides options for printing averages, providing feedback, exporting data, printing CSV contents, and exiting.
+        Provides options for printing averages, providing feedback, exporting data, printing CSV contents,
+        printing approximate averages, and exiting.
         """
         while True:
             print("\nAvailable functionalities:")
@@ -205,9 +301,10 @@ class Analysis:
             print("2. Provide feedback based on averages")
             print("3. Export analysis to CSV")
             print("4. Print CSV file contents")
-            print("5. Exit menu")
+            print("5. Print approximate customer rating")
+            print("6. Exit menu")
 
-            choice = input("Select a functionality (1-5): \n").strip()
+            choice = input("Select a functionality (1-6): \n").strip()
 
             if choice == '1':
                 self.print_survey_averages()
@@ -223,6 +320,9 @@ class Analysis:
                 self.report_exporter.print_csv_contents()
 
             elif choice == '5':
+                self.print_approximate_averages()
+
+            elif choice == '6':
                 # Ask if the user wants to perform another action
                 while True:
                     continue_choice = input("Would you like to perform any other actions? (yes/no):\n").strip().lower()
@@ -236,7 +336,7 @@ class Analysis:
                         print("Please enter 'yes' or 'no'.")
 
             else:
-                print("Invalid choice. Please select a number between 1 and 5.")
+                print("Invalid choice. Please select a number between 1 and 6.")
 
     def handle_export_csv(self):
         """
@@ -298,4 +398,20 @@ class Analysis:
             "Recommendation"
         ]
         for average, criterion in zip(averages, criteria):
-            print(f"{criterion}: {average}")
\ No newline at end of file
+            print(f"{criterion}: {average}")
+
+    def print_approximate_averages(self):
+        """
+        Estimate and print survey averages from a sample of the responses.
+        Displays each estimated average with its 95% confidence interval.
+        """
+        estimates, sample_size = self.data_analyzer.estimate_averages()
+        print(f"\nApproximate Customer Rating List ({sample_size} responses used):")
+        criteria = [
+            "Overall Satisfaction",
+            "Product Quality",
+            "Customer Support",
+            "Recommendation"
+        ]
+        for (mean, lower, upper), criterion in zip(estimates, criteria):
+            print(f"{criterion}: {mean:.2f} (95% CI {lower:.2f} - {upper:.2f})")
@@ -0,0 +1,210 @@
+import os
+import json
+import math
+from datetime import datetime
+
+class RatingAnomalyDetector:
+    """
+    Detects sudden drops in survey ratings as responses arrive.
+    Keeps a constant amount of state per question: an exponentially weighted
+    moving average (EWMA) of the ratings as the baseline and a one-sided CUSUM
+    of the drops below it. Alerts are appended to a local log file.
+
+    A single low rating does not raise an alert, a sustained drop does:
+
+    >>> detector = RatingAnomalyDetector(state_file=os.devnull)
+    >>> [detector.update(0, 5, customer_id) for customer_id in range(20)].count(None)
+    20
+    >>> detector.update(0, 1, 20) is None
+    True
+    >>> alerts = [detector.update(0, 1, customer_id) for customer_id in range(21, 26)]
+    >>> any(alerts)
+    True
+    """
+    criteria = [
+        "Overall Satisfaction",
+        "Product Quality",
+        "Customer Support",
+        "Recommendation"
+    ]
+
+    def __init__(self, state_file='reports/anomaly_state.json',
+                 alert_file='reports/anomaly_alerts.log',
+                 alpha=0.1, slack=0.5, max_step=2.0, threshold=6.0, warmup=10):
+        """
+        Initialize the detector and load its state from the previous run.
+
+        :param state_file: Path to the JSON file holding the detector state.
+        :param alert_file: Path to the log file that alerts are appended to.
+        :param alpha: Weight of the newest rating in the EWMA baseline.
+        :param slack: Drop, in standard deviations, tolerated before the CUSUM grows.
+        :param max_step: Largest drop, in standard deviations, counted from a single rating.
+        :param threshold: CUSUM value at which an alert is raised.
+        :param warmup: Number of ratings used to build the baseline before alerting.
+        """
+        self.state_file = state_file
+        self.alert_file = alert_file
+        self.alpha = alpha
+        self.slack = slack
+        self.max_step = max_step
+        self.threshold = threshold
+        self.warmup = warmup
+        self.state = self.load_state()
+
+    def new_state(self):
+        """
+        Return an empty detector state.
+        """
+        return {
+            "last_customer_id": 0,  # Rows up to this ID have already been observed
+            "questions": [
+                {"count": 0, "mean": 0.0, "variance": 0.0, "cusum": 0.0}
+                for _ in self.criteria
+            ]
+        }
+
+    def load_state(self):
+        """
+        Load the detector state from the state file.
+        Starts with an empty state if the file is missing, unreadable or incomplete.
+        """
+        try:
+            with open(self.state_file, mode='r', encoding='utf-8') as file:
+                state = json.load(file)
+            if self.is_valid_state(state):
+                return state
+        except (OSError, ValueError):
+            pass
+        return self.new_state()
+
+    def is_valid_state(self, state):
+        """
+        Check that a loaded state has every key the detector needs.
+        """
+        if not isinstance(state, dict) or not isinstance(state.get("last_customer_id"), int):
+            return False
+        questions = state.get("questions")
+        if not isinstance(questions, list) or len(questions) != len(self.criteria):
+            return False
+        return all(
+            isinstance(question, dict)
+            and all(isinstance(question.get(key), (int, float)) for key in ("count", "mean", "variance", "cusum"))
+            for question in questions
+        )
+
+    def save_state(self):
+        """
+        Write the detector state to the state file.
+        """
+        try:
+            directory = os.path.dirname(self.state_file)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            with open(self.state_file, mode='w', encoding='utf-8') as file:
+                json.dump(self.state, file)
+        except OSError as e:
+            print(f"An error occurred while saving the anomaly detector state: {e}")
+
+    def observe_rows(self, rows, complete=True):
+        """
+        Feed survey rows into the detector and return any alerts raised.
+        Each row holds the customer ID followed by the four ratings; rows that
+        have already been observed or are malformed are skipped.
+
+        :param rows: Survey rows, without the header row.
+        :param complete: True if the rows are the whole worksheet. The state is then
+            reset when the sheet no longer reaches the last observed ID (it was cleared).
+            Otherwise only a row directly following the last observed ID is fed, and
+            any gap is left for the next complete refresh to backfill.
+        """
+        parsed_rows = [parsed for parsed in map(self.parse_row, rows) if parsed]
+        alerts = []
+        changed = False
+
+        if complete:
+            last_sheet_id = max((customer_id for customer_id, _ in parsed_rows), default=0)
+            if last_sheet_id < self.state["last_customer_id"]:
+                self.state = self.new_state()  # The sheet was cleared or rewritten
+                changed = True
+
+        for customer_id, ratings in parsed_rows:
+            if customer_id <= self.state["last_customer_id"]:
+                continue  # Already observed in an earlier submission or refresh
+            if not complete and customer_id != self.state["last_customer_id"] + 1:
+                continue  # Rows in between were never observed
+
+            for index, rating in enumerate(ratings):
+                alert = self.update(index, rating, customer_id)
+                if alert:
+                    alerts.append(alert)
+
+            self.state["last_customer_id"] = customer_id
+            changed = True
+
+        if changed:
+            self.save_state()
+        if alerts:
+            self.write_alerts(alerts)
+        return alerts
+
+    def parse_row(self, row):
+        """
+        Return the customer ID and ratings of a survey row as integers.
+        Returns None if the row is incomplete or holds non-numeric values.
+        """
+        try:
+            values = [int(value) for value in row[:len(self.criteria) + 1]]
+        except (TypeError, ValueError):
+            return None
+        if len(values) != len(self.criteria) + 1:
+            return None
+        return values[0], values[1:]
+
+    def update(self, index, rating, customer_id):
+        """
+        Update the state of one question with a new rating.
+        Returns an alert message if the ratings have dropped, otherwise None.
+        """
+        question = self.state["questions"][index]
+        alert = None
+
+        if question["count"] >= self.warmup:
+            # Accumulate drops below the baseline, measured in standard deviations
+            std = max(math.sqrt(question["variance"]), 0.5)  # Floor avoids alerts on a flat baseline
+            # Cap each rating's contribution so a single outlier cannot raise an alert
+            drop = min((question["mean"] - rating) / std, self.max_step)
+            question["cusum"] = max(0.0, question["cusum"] + drop - self.slack)
+
+            if question["cusum"] > self.threshold:
+                alert = (
+                    f"{self.criteria[index]} ratings dropped: customer {customer_id} "
+                    f"rated {rating}, baseline average {question['mean']:.2f}."
+                )
+                question["cusum"] = 0.0  # Reset so a lasting drop is reported again later
+
+        # Update the EWMA baseline and variance
+        if question["count"] == 0:
+            question["mean"] = float(rating)
+        else:
+            difference = rating - question["mean"]
+            increment = self.alpha * difference
+            question["mean"] += increment
+            question["variance"] = (1 - self.alpha) * (question["variance"] + difference * increment)
+        question["count"] += 1
+
+        return alert
+
+    def write_alerts(self, alerts):
+        """
+        Append alert messages to the alert log with a timestamp.
+        """
+        try:
+            directory = os.path.dirname(self.alert_file)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with open(self.alert_file, mode='a', encoding='utf-8') as file:
+                for alert in alerts:
+                    file.write(f"{timestamp} {alert}\n")
+        except OSError as e:
+            print(f"An error occurred while writing anomaly alerts: {e}")
@@ -1,3 +1,4 @@
+import threading
 import gspread
 from google.oauth2.service_account import Credentials
 
@@ -25,10 +26,41 @@ class GoogleSheet:
         gspread_client = gspread.authorize(scoped_creds)
         # Open the specified Google Sheets document
         self.sheet = gspread_client.open(sheet_name)  
+        # Worksheet handles cached by name for the life of this instance
+        self.worksheets = {}
+        # Guards the cache when worksheets are looked up from a background thread
+        self.worksheets_lock = threading.Lock()
 
     def get_worksheet(self, worksheet_name):
         """
         Retrieve the worksheet object by its name.
-        Provides access to perform operations on the specified worksheet.
+        Handles are cached, so the spreadsheet metadata is fetched only once.
         """
-        return self.sheet.worksheet(worksheet_name)  # Return the worksheet object 
\ No newline at end of file
+        with self.worksheets_lock:
+            if worksheet_name not in self.worksheets:
+                # A single metadata request returns the handles of every tab
+                for worksheet in self.sheet.worksheets():
+                    self.worksheets[worksheet.title] = worksheet
+            if worksheet_name not in self.worksheets:
+                # Fall back to gspread's lookup, which raises WorksheetNotFound
+                self.worksheets[worksheet_name] = self.sheet.worksheet(worksheet_name)
+            return self.worksheets[worksheet_name]  # Return the worksheet object
+
+    def batch_get_values(self, worksheet_names):
+        """
+        Retrieve all values of several worksheets in a single request.
+        Returns a dictionary mapping each worksheet name to its list of rows.
+        """
+        # A bare sheet name selects the whole tab; quotes inside it are doubled
+        ranges = ["'{}'".format(name.replace("'", "''")) for name in worksheet_names]
+        response = self.sheet.values_batch_get(ranges)
+        value_ranges = response.get("valueRanges", [])
+        if len(value_ranges) != len(ranges):
+            raise ValueError(
+                f"Expected {len(ranges)} value ranges but received {len(value_ranges)}."
+            )
+        # Value ranges are returned in the same order as they were requested
+        return {
+            name: value_range.get("values", [])  # Empty tabs have no 'values' key
+            for name, value_range in zip(worksheet_names, value_ranges)
+        }
@@ -1,3 +1,5 @@
+import modules.anomaly_module as ad
+
 class Survey:
     """
     Handles customer survey responses.
@@ -6,13 +8,25 @@ class Survey:
     def __init__(self, google_sheet):
         """
         Initialize the Survey class with the Google Sheets worksheet for survey.
+        The worksheet is looked up on first use, so creating a Survey is free.
         """
-        self.sheet = google_sheet.get_worksheet("survey")  # Get the "survey" worksheet from Google Sheets
+        self.google_sheet = google_sheet
+        self.anomaly_detector = ad.RatingAnomalyDetector()  # Watches for sudden rating drops
+        self.survey_rows = None  # Worksheet rows read when the customer ID was assigned
 
-    def get_customer_answers(self):
+    @property
+    def sheet(self):
+        """
+        Return the "survey" worksheet from Google Sheets.
+        """
+        return self.google_sheet.get_worksheet("survey")  # Handle is cached by GoogleSheet
+
+    def get_customer_answers(self, snapshot=None):
         """
         Collect customer survey responses and assign a new customer ID.
         Prompts the user to answer a series of questions and validates their input.
+        If a snapshot future is given, the customer ID is taken from the worksheet
+        rows it loads in the background while the questions are being answered.
         """
         print("\nPlease rate your customer experience in the next four questions.")
         print("Data must be a number from 1-5 based on the following:")
@@ -25,8 +39,6 @@ class Survey:
               """)
 
         responses = []  # List to store customer responses
-        last_customer_id = self.get_last_customer_id()  # Get the last customer ID from the worksheet
-        current_customer_id = last_customer_id + 1  # Increment ID for the new customer
 
         questions = [
             "How would you rate your overall satisfaction with our service? (1-5): \n",
@@ -35,8 +47,6 @@ class Survey:
             "Would you to recommend our product/service to a friend or colleague? (1-5): \n"
         ]
 
-        responses.append(current_customer_id)  # Add the new customer ID to the responses
-
         for question in questions:
             while True:
                 response = input(question)  # Prompt user for a response
@@ -47,6 +57,21 @@ class Survey:
                 except ValueError as e:
                     print(e)  # Print validation error message and re-prompt
 
+        # Assign the ID only now, so the worksheet read overlaps with the questions
+        data = None
+        if snapshot is not None:
+            try:
+                data = snapshot.result()
+            except Exception as e:
+                # Keep the answers and read the worksheet directly instead
+                print(f"Could not use the preloaded survey data ({e}). Retrying...")
+        if data is None:
+            data = self.sheet.get_all_values()  # Get all values from the worksheet
+        self.survey_rows = data
+        last_customer_id = self.get_last_customer_id(data)  # Get the last customer ID from the worksheet
+        current_customer_id = last_customer_id + 1  # Increment ID for the new customer
+        responses.insert(0, current_customer_id)  # Add the new customer ID to the responses
+
         return responses
 
     def validate_response(self, response):
@@ -63,12 +88,14 @@ class Survey:
         except ValueError:
             raise ValueError("Invalid input. Please enter a number between 1 and 5.")  # Handle non-integer inputs
 
-    def get_last_customer_id(self):
+    def get_last_customer_id(self, data=None):
         """
         Retrieve the last customer ID from the survey worksheet.
+        Uses the given worksheet rows if provided, otherwise reads the worksheet.
         If no previous data exists, start with ID 1.
         """
-        data = self.sheet.get_all_values()  # Get all values from the worksheet
+        if data is None:
+            data = self.sheet.get_all_values()  # Get all values from the worksheet
         if len(data) > 1:
             last_row = data[-1]  # Get the last row of data
             last_customer_id = int(last_row[0])  # Customer ID is in the first column of the last row
@@ -82,5 +109,15 @@ class Survey:
         Appends the collected responses to the Google Sheets worksheet.
         """
         self.sheet.append_row(data)  # Append the new row of data to the worksheet
+        try:
+            # Alerts are written to the alert log
+            if self.survey_rows is not None:
+                # The rows read for the customer ID let the detector backfill any gap
+                self.anomaly_detector.observe_rows(self.survey_rows[1:] + [data])
+            else:
+                self.anomaly_detector.observe_rows([data], complete=False)
+        except Exception as e:
+            # The row is already saved, so a detector failure must not fail the submission
+            print(f"An error occurred while checking for rating drops: {e}")
         print("\nSurvey worksheet updated successfully.")  # Confirmation message
         print("Thanks for your feedback! \n")  # Thank the customer for their feedback
@@ -2,6 +2,10 @@ import modules.google_sheet as gs
 import modules.survey_module as sm
 import modules.analysis_module as am
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Background worker used to load sheet data while the user is typing
+executor = ThreadPoolExecutor(max_workers=1)
 
 def handle_user_role(user_role, google_sheet):
     """
@@ -15,10 +19,12 @@ def handle_user_role(user_role, google_sheet):
             sys.exit()  # Exit the program immediately
 
         if user_role == 'customer':
-            handle_customer_role(google_sheet)  # Handle actions specific to customers
+            snapshot = prefetch_survey_snapshot(google_sheet)  # Load data while questions are answered
+            handle_customer_role(google_sheet, snapshot)  # Handle actions specific to customers
 
         elif user_role == 'owner':
-            handle_owner_role(google_sheet)  # Handle actions specific to owners
+            snapshot = prefetch_survey_snapshot(google_sheet)  # Load data while the password is entered
+            handle_owner_role(google_sheet, snapshot)  # Handle actions specific to owners
 
         else:
             print("Invalid role. Please enter 'customer' or 'owner' or 'exit'.")
@@ -26,14 +32,26 @@ def handle_user_role(user_role, google_sheet):
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
 
-def handle_customer_role(google_sheet):
+def prefetch_survey_snapshot(google_sheet):
+    """
+    Start loading the survey worksheet in a background thread. 
+    Returns a future that resolves to all rows of the worksheet, so the 
+    network I/O overlaps with the time the user spends answering prompts.
+    """
+    def load_snapshot():
+        google_sheet.get_worksheet("survey")  # Warm the worksheet handle cache
+        return google_sheet.batch_get_values(["survey"])["survey"]
+
+    return executor.submit(load_snapshot)
+
+def handle_customer_role(google_sheet, snapshot=None):
     """
     Manage actions for the customer role. Collects customer survey responses 
     and updates the Google Sheet with these responses.
     """
     try:
         survey = sm.Survey(google_sheet)  # Initialize Survey instance
-        customer_responses = survey.get_customer_answers()  # Collect responses
+        customer_responses = survey.get_customer_answers(snapshot)  # Collect responses
         survey.update_survey_worksheet(customer_responses)  # Update worksheet
     except Exception as e:
         print(f"An error occurred while processing customer responses: {e}")
@@ -59,7 +77,7 @@ def validate_password():
         print(f"\nIncorrect password. The correct password is '{PASSWORD}'.")
         return False
 
-def handle_owner_role(google_sheet):
+def handle_owner_role(google_sheet, snapshot=None):
     """
     Manage actions for the owner role. Validates the password and, if correct, 
     updates the analysis and displays a menu of functionalities.
@@ -67,7 +85,14 @@ def handle_owner_role(google_sheet):
     if validate_password():
         try:
             analysis = am.Analysis(google_sheet)  # Initialize Analysis instance
-            analysis.update_analysis_worksheet()  # Update analysis worksheet
+            survey_rows = None
+            if snapshot is not None:
+                try:
+                    survey_rows = snapshot.result()
+                except Exception as e:
+                    # Let the analysis read the worksheet directly instead
+                    print(f"Could not use the preloaded survey data ({e}). Retrying...")
+            analysis.update_analysis_worksheet(survey_rows)  # Update analysis worksheet
 
             # Display menu of functionalities
             analysis.display_functionality_menu()